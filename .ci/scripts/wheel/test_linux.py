@@ -18,10 +18,11 @@ if __name__ == "__main__":
             _get_registered_backend_names,
         )
 
-        registered = _get_registered_backend_names()
-        assert (
-            "QnnBackend" in registered
-        ), f"QnnBackend not found in registered backends: {registered}"
+        registered = frozenset(_get_registered_backend_names())
+        if "QnnBackend" not in registered:
+            raise AssertionError(
+                f"QnnBackend not found in registered backends: {sorted(registered)}"
+            )
         print("✓ QnnBackend is registered")
 
     test_base.run_tests(
@@ -5,6 +5,9 @@
 
 import logging
 import multiprocessing
+import threading
+import weakref
+from array import array
 
 try:
     from eiq_neutron_sdk import neutron_converter, neutron_library_utils
@@ -13,16 +16,54 @@ except ImportError:
         "eIQ Neutron SDK not found. To install it, run 'examples/nxp/setup.sh'."
     )
 
+# Report warnings of the converter worker process. The multiprocessing logger is a
+# singleton, so it only needs to be set up once.
+multiprocessing.log_to_stderr().setLevel(logging.WARNING)
 
-def convert_unsafe(neutron_converter, tflite_model, cctx, queue):
+
+def _create_compilation_context(target: str, fetch_constants_to_sram: bool):
+    cctx = neutron_converter.CompilationContext()
+    cctx.targetOpts = neutron_converter.getNeutronTarget(target)
+    cctx.compilationOpts.minNumOpsPerGraph = 1
+    cctx.compilationOpts.excludeGraphPasses = "HoistSliceAboveTranspose,MergeTranspose"
+    cctx.compilationOpts.fetchConstantsToSRAM = fetch_constants_to_sram
+    return cctx
+
+
+def convert_unsafe(tflite_model, target, fetch_constants_to_sram) -> bytes:
+    """
+    Run neutron_converter on given tflite_model for the given target.
+    The neutron_converter may terminate the whole process on failure, so this routine
+    is supposed to run in a separate process (see `_converter_worker`).
+    """
+    cctx = _create_compilation_context(target, fetch_constants_to_sram)
+    # `convertModel` takes a pybind11 vector of ints, and pybind11 refuses to convert
+    # `bytes`/`str` into a vector, so the model can't be passed as is. An array stores
+    # 1 byte per element instead of the 8-byte object pointer of a list element.
+    model_converted = neutron_converter.convertModel(array("B", tflite_model), cctx)
+    return bytes(model_converted)
+
+
+def _converter_worker(conn):
     """
-    Run neutron_converter on given tflite_model with compilation context cctx.
-    This routine is supposed to run in a separate process.
-    If properly finished, the output queue contains the converted model,
-    otherwise the neutron_converter exits and the output queue is empty.
+    Serve conversion requests received through conn until the other end is closed.
+    This routine is supposed to run in a separate process. Every request is a tuple
+    (tflite_model, target, fetch_constants_to_sram) and is answered with the converted
+    model. If the neutron_converter crashes, the process exits and conn is closed
+    without any reply.
     """
-    model_converted = neutron_converter.convertModel(list(tflite_model), cctx)
-    queue.put(model_converted)
+    while True:
+        try:
+            tflite_model, target, fetch_constants_to_sram = conn.recv()
+        except EOFError:  # The manager closed the connection.
+            break
+        conn.send_bytes(convert_unsafe(tflite_model, target, fetch_constants_to_sram))
+
+
+def _stop_worker(worker, conn):
+    conn.close()  # The worker exits once it reads EOF.
+    worker.join()
+    worker.close()
 
 
 class NeutronConverterManager:
@@ -32,7 +73,44 @@ class NeutronConverterManager:
     """
 
     def __init__(self):
-        pass
+        # Worker process running `_converter_worker`, started on the first conversion
+        # and reused by the following ones, so the Neutron SDK is only imported once.
+        self._worker = None
+        self._conn = None
+        # Stops the worker when the manager is garbage collected or at interpreter exit.
+        self._finalizer = None
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            mp_context = multiprocessing.get_context("forkserver")
+            parent_conn, child_conn = mp_context.Pipe()
+            worker = mp_context.Process(
+                target=_converter_worker, args=(child_conn,), daemon=True
+            )
+            worker.start()
+            # Drop the parent's copy of the worker end, so `recv_bytes()` reports EOF
+            # if the worker dies.
+            child_conn.close()
+            self._worker, self._conn = worker, parent_conn
+            self._finalizer = weakref.finalize(self, _stop_worker, worker, parent_conn)
+
+        return self._conn
+
+    def close(self):
+        """Shut down the worker process, if it is running."""
+        with self._lock:
+            if self._worker is None:
+                return
+
+            self._finalizer()
+            self._worker, self._conn, self._finalizer = None, None, None
 
     def get_converter(self):
         return neutron_converter
@@ -65,41 +143,36 @@ class NeutronConverterManager:
         # Neutron converter crashes if we provide invalid target -> verify.
         self.verify_target(target)
 
-        cctx = neutron_converter.CompilationContext()
-        cctx.targetOpts = neutron_converter.getNeutronTarget(target)
-        cctx.compilationOpts.minNumOpsPerGraph = 1
-        cctx.compilationOpts.excludeGraphPasses = (
-            "HoistSliceAboveTranspose,MergeTranspose"
-        )
-        cctx.compilationOpts.fetchConstantsToSRAM = fetch_constants_to_sram
-
-        # Try to use multiprocessing for isolation, but fall back to direct execution
-        # if the environment doesn't support it (e.g., in sandcastle/build environments)
-        try:
-            logger = multiprocessing.log_to_stderr()
-            logger.setLevel(logging.WARNING)
-            queue = multiprocessing.Manager().Queue()
-
-            process = multiprocessing.Process(
-                target=convert_unsafe,
-                args=(neutron_converter, tflite_model, cctx, queue),
-            )
-            process.start()
-            process.join()  # waits until the subprocess is complete
-
-            if queue.empty():  # signals the unsafe task did not run till the end
+        # The worker handles one job at a time; the lock also guards its (re)start.
+        with self._lock:
+            # Try to use multiprocessing for isolation, but fall back to direct execution
+            # if the environment doesn't support it (e.g., in sandcastle/build environments)
+            try:
+                conn = self._ensure_worker()
+            # ValueError: the forkserver start method is not supported.
+            except (OSError, ValueError) as e:
+                # Multiprocessing failed (likely due to environment restrictions)
+                # Fall back to direct execution
+                logging.warning(
+                    f"Multiprocessing not available ({e}), running neutron converter directly"
+                )
+                return convert_unsafe(tflite_model, target, fetch_constants_to_sram)
+
+            job = (tflite_model, target, fetch_constants_to_sram)
+            try:
+                conn.send(job)
+            except BrokenPipeError:
+                # The worker died since the previous conversion -> start a new one.
+                self.close()
+                conn = self._ensure_worker()
+                conn.send(job)
+
+            try:
+                return conn.recv_bytes()
+            except EOFError:  # signals the unsafe task did not run till the end
+                self._worker.join()
+                exit_code = self._worker.exitcode
+                self.close()
                 raise RuntimeError(
-                    f"Neutron converter module terminated unexpectedly with exit code {process.exitcode}"
+                    f"Neutron converter module terminated unexpectedly with exit code {exit_code}"
                 )
-
-            model_converted = queue.get()
-            process.close()
-        except (EOFError, OSError) as e:
-            # Multiprocessing failed (likely due to environment restrictions)
-            # Fall back to direct execution
-            logging.warning(
-                f"Multiprocessing not available ({e}), running neutron converter directly"
-            )
-            model_converted = neutron_converter.convertModel(list(tflite_model), cctx)
-
-        return bytes(model_converted)
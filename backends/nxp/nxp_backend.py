@@ -146,6 +146,9 @@ def generate_neutron_compile_spec(
 
 @final
 class NeutronBackend(BackendDetails):
+    # Shared by all partitions, so the converter worker process is reused between them.
+    # The manager stops the worker at interpreter exit.
+    _converter_manager = NeutronConverterManager()
 
     @staticmethod
     def preprocess(  # noqa C901
@@ -213,7 +216,7 @@ class NeutronBackend(BackendDetails):
                 conversion_config=conversion_config,
             )
 
-            neutron_model = NeutronConverterManager().convert(
+            neutron_model = NeutronBackend._converter_manager.convert(
                 tflite_model, target, fetch_constants_to_sram
             )
 
@@ -3,6 +3,9 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 import torch
 
 from executorch import exir
@@ -17,7 +20,7 @@ from executorch.backends.nxp.tests.executorch_pipeline import to_quantized_edge_
 from executorch.backends.nxp.tests.models import Conv2dModule, LinearModule
 
 
-def test_conv2d_neutron_conversion():
+def _conv2d_tflite_model() -> bytes:
     model = Conv2dModule()
 
     example_input = (torch.ones(1, 4, 32, 32),)
@@ -29,15 +32,108 @@ def test_conv2d_neutron_conversion():
     tflite_model, _ = edge_program_converter.convert_program(
         edge_program_manager.exported_program()
     )
+    return tflite_model
 
-    neutron_converter_manager = NeutronConverterManager()
-    neutron_model = neutron_converter_manager.convert(tflite_model, "imxrt700", False)
+
+def test_conv2d_neutron_conversion():
+    tflite_model = _conv2d_tflite_model()
+
+    with NeutronConverterManager() as neutron_converter_manager:
+        neutron_model = neutron_converter_manager.convert(
+            tflite_model, "imxrt700", False
+        )
 
     assert len(
         neutron_model
     ), "Produced NeutronGraph-based TFLite model has zero length!"
 
 
+def test_worker_reused_between_conversions():
+    tflite_model = _conv2d_tflite_model()
+
+    with NeutronConverterManager() as neutron_converter_manager:
+        first_model = neutron_converter_manager.convert(tflite_model, "imxrt700")
+        worker = neutron_converter_manager._worker
+        second_model = neutron_converter_manager.convert(tflite_model, "imxrt700")
+
+        assert worker is not None
+        assert neutron_converter_manager._worker is worker
+        assert first_model == second_model
+
+
+def test_concurrent_conversions_share_worker():
+    tflite_model = _conv2d_tflite_model()
+
+    with NeutronConverterManager() as neutron_converter_manager:
+        expected_model = neutron_converter_manager.convert(tflite_model, "imxrt700")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            neutron_models = list(
+                executor.map(
+                    lambda _: neutron_converter_manager.convert(
+                        tflite_model, "imxrt700"
+                    ),
+                    range(8),
+                )
+            )
+
+    assert all(neutron_model == expected_model for neutron_model in neutron_models)
+
+
+def test_close_joins_worker(mocker):
+    neutron_converter_manager = NeutronConverterManager()
+    neutron_converter_manager.convert(_conv2d_tflite_model(), "imxrt700")
+    join_spy = mocker.spy(neutron_converter_manager._worker, "join")
+
+    neutron_converter_manager.close()
+
+    join_spy.assert_called_once()
+    assert neutron_converter_manager._worker is None
+    assert neutron_converter_manager._conn is None
+
+
+def test_worker_restarted_after_it_died():
+    tflite_model = _conv2d_tflite_model()
+
+    with NeutronConverterManager() as neutron_converter_manager:
+        neutron_converter_manager.convert(tflite_model, "imxrt700")
+        worker = neutron_converter_manager._worker
+        worker.kill()
+        worker.join()
+
+        neutron_model = neutron_converter_manager.convert(tflite_model, "imxrt700")
+
+        assert len(neutron_model)
+        assert neutron_converter_manager._worker is not worker
+
+
+def test_worker_crash_during_conversion(mocker):
+    # The Neutron converter terminates the process for invalid targets.
+    mocker.patch.object(NeutronConverterManager, "verify_target")
+
+    with NeutronConverterManager() as neutron_converter_manager:
+        with pytest.raises(RuntimeError, match="terminated unexpectedly"):
+            neutron_converter_manager.convert(
+                _conv2d_tflite_model(), "invalid_target"
+            )
+
+        assert neutron_converter_manager._worker is None
+        assert neutron_converter_manager._conn is None
+
+
+def test_conversion_without_multiprocessing(mocker):
+    mocker.patch.object(
+        NeutronConverterManager, "_ensure_worker", side_effect=OSError("no fork")
+    )
+
+    with NeutronConverterManager() as neutron_converter_manager:
+        neutron_model = neutron_converter_manager.convert(
+            _conv2d_tflite_model(), "imxrt700"
+        )
+
+        assert len(neutron_model)
+        assert neutron_converter_manager._worker is None
+
+
 def test_conv2d_neutron_conversion__prefetching(mocker):
     model = LinearModule(True)
     input_shape = (1, 1, 32, 32)
@@ -4,33 +4,27 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree..
 
+import copy
+import functools
 import sys
 from typing import Tuple
 from unittest.mock import MagicMock
 
 # Stub modules that are transitively imported by arm_quantizer but never
-# exercised by these tests.
-for _mod in ("tosa_serializer", "tosa", "tosa.TosaGraph"):
-    if _mod not in sys.modules:
-        try:
-            __import__(_mod)
-        except ModuleNotFoundError:
-            sys.modules[_mod] = MagicMock()
+# exercised by these tests. They are all provided by the TOSA serialization
+# package, so only probe for one of them and keep the real ones if installed.
+try:
+    import tosa_serializer  # noqa: F401
+except ModuleNotFoundError:
+    for _mod in ("tosa_serializer", "tosa", "tosa.TosaGraph"):
+        sys.modules.setdefault(_mod, MagicMock())
 
 import pytest
 import torch
-from executorch.backends.arm.quantizer.arm_quantizer import (
-    get_symmetric_quantization_config,
-    TOSAQuantizer,
-)
-from executorch.backends.arm.tosa import TosaSpecification
 from executorch.backends.transforms.quantize_fused_convbn_bias_pass import (
     QuantizeFusedConvBnBiasAtenPass,
 )
 from torch import nn
-from torch.export import export
-from torchao.quantization.pt2e import move_exported_model_to_eval
-from torchao.quantization.pt2e.quantize_pt2e import convert_pt2e, prepare_qat_pt2e
 
 
 input_t = Tuple[torch.Tensor]
@@ -99,14 +93,26 @@ class ConvNoBnNoBias(nn.Module):
 # --- Shared helpers ---
 
 
-def _qat_prepare_convert(model, per_channel):
+@functools.lru_cache(maxsize=None)
+def _qat_prepare_convert_cached(model_cls, per_channel):
     """QAT prepare -> calibrate -> convert_pt2e, returns GraphModule with get_attr nodes."""
+    # The quantization stack is imported lazily, so collecting the tests stays cheap.
+    pytest.importorskip("torchao.quantization.pt2e")
+    from executorch.backends.arm.quantizer.arm_quantizer import (
+        get_symmetric_quantization_config,
+        TOSAQuantizer,
+    )
+    from executorch.backends.arm.tosa import TosaSpecification
+    from torchao.quantization.pt2e import move_exported_model_to_eval
+    from torchao.quantization.pt2e.quantize_pt2e import convert_pt2e, prepare_qat_pt2e
+
     quantizer = TOSAQuantizer(TosaSpecification.create_from_string("TOSA-1.0+INT"))
     quantizer.set_global(
         get_symmetric_quantization_config(is_qat=True, is_per_channel=per_channel)
     )
+    model = model_cls()
     example_input = model.get_inputs()
-    exported = export(model, example_input, strict=True).module()
+    exported = torch.export.export(model, example_input, strict=True).module()
     prepared = prepare_qat_pt2e(exported, quantizer)
     prepared(*example_input)
     move_exported_model_to_eval(prepared)
@@ -114,6 +120,12 @@ def _qat_prepare_convert(model, per_channel):
     return converted
 
 
+def _qat_prepare_convert(model_cls, per_channel):
+    """Returns a fresh copy of the QAT converted model, which is shared between
+    tests (the passes under test modify it in place)."""
+    return copy.deepcopy(_qat_prepare_convert_cached(model_cls, per_channel))
+
+
 def _assert_bias_dequantized(graph, conv_targets, dequant_targets):
     """Assert every conv's bias flows through a dequantize node."""
     conv_count = 0
@@ -152,7 +164,7 @@ _aten_direct_models = [
 def test_aten_pass_direct(test_data) -> None:
     """QuantizeFusedConvBnBiasAtenPass on GraphModule (get_attr nodes, no EP)."""
     model_cls, per_channel = test_data
-    gm = _qat_prepare_convert(model_cls(), per_channel)
+    gm = _qat_prepare_convert(model_cls, per_channel)
     QuantizeFusedConvBnBiasAtenPass()(gm)
     _assert_bias_dequantized(gm.graph, _aten_conv_targets, _aten_dequant_targets)
 
@@ -161,9 +173,8 @@ def test_aten_pass_direct(test_data) -> None:
 def test_aten_pass_with_exported_program(test_data) -> None:
     """QuantizeFusedConvBnBiasAtenPass on graph_module from EP (placeholder nodes)."""
     model_cls, per_channel = test_data
-    model = model_cls()
-    gm = _qat_prepare_convert(model, per_channel)
-    ep = export(gm, model.get_inputs(), strict=True)
+    gm = _qat_prepare_convert(model_cls, per_channel)
+    ep = torch.export.export(gm, model_cls().get_inputs(), strict=True)
     QuantizeFusedConvBnBiasAtenPass(ep)(ep.graph_module)
     _assert_bias_dequantized(
         ep.graph_module.graph, _aten_conv_targets, _aten_dequant_targets
@@ -172,8 +183,7 @@ def test_aten_pass_with_exported_program(test_data) -> None:
 
 def test_aten_pass_idempotent() -> None:
     """Running the pass twice doesn't break."""
-    model = ConvBnNoBias()
-    gm = _qat_prepare_convert(model, per_channel=True)
+    gm = _qat_prepare_convert(ConvBnNoBias, True)
     QuantizeFusedConvBnBiasAtenPass()(gm)
     QuantizeFusedConvBnBiasAtenPass()(gm)
     _assert_bias_dequantized(gm.graph, _aten_conv_targets, _aten_dequant_targets)
@@ -181,6 +191,5 @@ def test_aten_pass_idempotent() -> None:
 
 def test_aten_pass_biasless_conv_no_bn() -> None:
     """Pass skips biasless conv without following BatchNorm."""
-    model = ConvNoBnNoBias()
-    gm = _qat_prepare_convert(model, per_channel=True)
+    gm = _qat_prepare_convert(ConvNoBnNoBias, True)
     QuantizeFusedConvBnBiasAtenPass()(gm)
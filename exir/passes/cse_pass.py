@@ -4,14 +4,48 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
-from typing import Any
+import functools
+import os
+from typing import Any, Optional
 
 import torch
 from executorch.exir.dialects.edge._ops import EdgeOpOverload
 from executorch.exir.pass_base import ExportPass, PassResult
 from torch.fx import GraphModule
+from torch.fx.immutable_collections import immutable_dict, immutable_list
 from torch.fx.node import Node
 
+# Separates positional from keyword args in a flat node signature. Never equal
+# to any hashable arg, so signatures with different arg splits can't collide.
+_KWARGS_SEPARATOR = object()
+
+
+@functools.lru_cache(maxsize=None)
+def _non_mutating_aten_schema_name(target) -> Optional[str]:
+    """
+    Return the schema name of an aten:: OpOverload/EdgeOpOverload target, or
+    None if the op is not an aten:: op or its schema mutates an argument.
+
+    Op schemas never change, so the introspection is cached across CSEPass runs.
+    """
+    # Edge schemas forward attribute access through __getattr__, so look the
+    # schema up once.
+    schema = target._schema
+    schema_name = schema.name
+
+    # Only trust schema introspection for aten:: ops.
+    # Custom op schemas (mlx::, torchao::, etc.) may not accurately
+    # annotate mutation or side effects — default to unsafe.
+    if not schema_name.startswith("aten::"):
+        return None
+
+    # Check schema for mutating arguments
+    for arg in schema.arguments:
+        if arg.alias_info is not None and arg.alias_info.is_write:
+            return None
+
+    return schema_name
+
 
 class CSEPass(ExportPass):
     """
@@ -20,9 +54,11 @@ class CSEPass(ExportPass):
     Deduplicates operations with identical computation structure, replacing
     redundant computations with references to previously computed results.
 
-    Uses recursive structural keys: two nodes are equivalent if they have the
-    same op and their inputs are structurally equivalent. This naturally handles
-    chains like item(select(select(x, 0, a), 0, b)) without special cases.
+    Uses structural keys: two nodes are equivalent if they have the same op and
+    their inputs are structurally equivalent. Nodes are numbered bottom-up in
+    graph (topological) order, so the inputs of a node are always numbered
+    before the node itself. This naturally handles chains like
+    item(select(select(x, 0, a), 0, b)) without special cases or recursion.
 
     Safety is determined automatically via op schema introspection:
     - For OpOverload targets (aten ops): checks _schema for mutating arguments
@@ -66,136 +102,171 @@ class CSEPass(ExportPass):
 
         # EdgeOpOverload targets (edge dialect ops)
         if isinstance(target, (torch._ops.OpOverload, EdgeOpOverload)):
-            schema_name = target._schema.name
-
-            # Only trust schema introspection for aten:: ops.
-            # Custom op schemas (mlx::, torchao::, etc.) may not accurately
-            # annotate mutation or side effects — default to unsafe.
-            if not schema_name.startswith("aten::"):
+            schema_name = _non_mutating_aten_schema_name(target)
+            if schema_name is None:
                 return False
 
             # Check denylist for non-deterministic/side-effecting ops
-            if schema_name in self.UNSAFE_OPS:
-                return False
+            return schema_name not in self.UNSAFE_OPS
 
-            # Check schema for mutating arguments
-            for arg in target._schema.arguments:
-                if arg.alias_info is not None and arg.alias_info.is_write:
-                    return False
-
-            return True
+        return False
 
+    @staticmethod
+    def _has_repeated_target(graph) -> bool:
+        """Whether any call_function target occurs more than once in graph."""
+        seen = set()
+        for node in graph.nodes:
+            if node.op != "call_function":
+                continue
+            try:
+                if node.target in seen:
+                    return True
+                seen.add(node.target)
+            except TypeError:  # Unhashable targets are never merged.
+                pass
         return False
 
     def call(self, graph_module: GraphModule) -> PassResult:
         graph = graph_module.graph
 
+        # Only nodes with the same target can be merged. Skip the setup below
+        # when there is nothing to deduplicate (e.g. small graphs).
+        if not self._has_repeated_target(graph):
+            return PassResult(graph_module, False)
+
         # Discover graph output nodes — includes buffer mutation outputs
         # (e.g. index_copy for KV cache). These must never be deduplicated
         # because the graph signature references them by name for writeback.
-        output_node = next(n for n in graph.nodes if n.op == "output")
-        self._output_nodes: set[Node] = set()
-        for arg in output_node.args[0]:
-            if isinstance(arg, Node):
-                self._output_nodes.add(arg)
-
-        self._vn_cache: dict[Node, int] = {}  # Node → value number
-        self._safe_cache: dict[Any, bool] = {}  # Cache for _is_safe_target
-        self._sig_to_vn: dict[Any, int] = {}  # flat signature → value number
-        self._vn_to_node: dict[int, Node] = {}  # value number → canonical node
-        self._next_vn = 0
+        # The output node is (almost always) the last node, so search backwards.
+        output_node = next(n for n in reversed(graph.nodes) if n.op == "output")
+        self._output_nodes: set[Node] = {
+            arg for arg in output_node.args[0] if isinstance(arg, Node)
+        }
+
+        self._vn_cache: dict[Node, Node] = {}  # Node → canonical node
+        self._safe_cache: dict[Any, bool] = {}  # target → _is_safe_target
+        self._sig_to_node: dict[Any, Node] = {}  # flat signature → canonical node
         modified = False
 
-        for node in list(graph.nodes):
-            vn = self._value_number(node)
+        canonical_node = self._canonical_node
 
-            if vn in self._vn_to_node:
-                canonical = self._vn_to_node[vn]
-                if canonical is not node:
-                    node.replace_all_uses_with(canonical)
-                    graph.erase_node(node)
-                    modified = True
-            else:
-                self._vn_to_node[vn] = node
+        # FX graphs are topologically sorted, so every input of a node already
+        # has a canonical node when the node is visited.
+        for node in list(graph.nodes):
+            canonical = canonical_node(node)
+            if canonical is not node:
+                node.replace_all_uses_with(canonical)
+                graph.erase_node(node)
+                modified = True
 
         if modified:
             graph.eliminate_dead_code()
-            graph.lint()
+            # Nodes are only rewired to equivalent, earlier nodes and then
+            # erased, which keeps the graph valid. Linting is expensive on
+            # large graphs, so only do it when debugging.
+            if os.environ.get("EXECUTORCH_CSE_LINT", "0") == "1":
+                graph.lint()
 
         return PassResult(graph_module, modified)
 
     def _is_safe(self, target) -> bool:
-        """Cached version of _is_safe_target."""
-        tid = id(target)
-        if tid not in self._safe_cache:
-            self._safe_cache[tid] = self._is_safe_target(target)
-        return self._safe_cache[tid]
-
-    def _new_vn(self) -> int:
-        """Allocate a fresh unique value number."""
-        vn = self._next_vn
-        self._next_vn += 1
-        return vn
-
-    def _value_number(self, node: Node) -> int:
+        """Cached version of _is_safe_target. Unhashable targets are unsafe."""
+        try:
+            safe = self._safe_cache.get(target)
+        except TypeError:
+            return False
+        if safe is None:
+            safe = self._safe_cache[target] = self._is_safe_target(target)
+        return safe
+
+    def _canonical_node(self, node: Node) -> Node:
         """
-        Assign an integer value number to a node (global value numbering).
+        Return the first node structurally equivalent to node (global value
+        numbering), which is node itself if there is none.
+
+        The canonical node serves as the value number: two nodes with the same
+        canonical node are structurally equivalent and can be deduplicated.
+        All signature tuples are flat (contain only canonical nodes, which hash
+        by identity, and scalars), so hashing is O(n_args) not O(graph_depth).
 
-        Two nodes with the same value number are structurally equivalent
-        and can be deduplicated. All signature tuples are flat (contain
-        only ints and scalars), so hashing is O(n_args) not O(graph_depth).
+        Inputs are expected to be numbered already (see `call`). If the graph is
+        not topologically sorted and an input isn't, node is kept unique.
         """
-        if node in self._vn_cache:
-            return self._vn_cache[node]
-
-        if node.op != "call_function":
-            vn = self._new_vn()
-        elif node in self._output_nodes:
-            # Graph output node (includes buffer mutations like index_copy).
-            # Must keep unique — graph signature references this node by name.
-            vn = self._new_vn()
-        elif not self._is_safe(node.target):
-            vn = self._new_vn()
-        else:
+        canonical = node
+        target = node.target
+        # Graph output nodes (includes buffer mutations like index_copy) must
+        # keep unique — graph signature references them by name.
+        if (
+            node.op == "call_function"
+            and node not in self._output_nodes
+            and self._is_safe(target)
+        ):
+            make_hashable = self._make_hashable
             try:
-                args_sig = tuple(self._make_hashable(a) for a in node.args)
-                kwargs_sig = tuple(
-                    sorted((k, self._make_hashable(v)) for k, v in node.kwargs.items())
-                )
-                sig = (node.target, args_sig, kwargs_sig)
-
-                if sig in self._sig_to_vn:
-                    vn = self._sig_to_vn[sig]
-                else:
-                    vn = self._new_vn()
-                    self._sig_to_vn[sig] = vn
-            except TypeError:
-                vn = self._new_vn()
-
-        self._vn_cache[node] = vn
-        return vn
+                # Single flat signature: (target, *args, separator, k0, v0, k1, v1, ...)
+                sig_parts = [target]
+                sig_parts.extend(make_hashable(a) for a in node.args)
+                sig_parts.append(_KWARGS_SEPARATOR)
+                # Sort by the (str) keys only, never comparing the values.
+                for k, v in sorted(node.kwargs.items()):
+                    sig_parts.append(k)
+                    sig_parts.append(make_hashable(v))
+                sig = tuple(sig_parts)
+
+                canonical = self._sig_to_node.setdefault(sig, node)
+            except (KeyError, TypeError):  # KeyError: input not numbered yet
+                pass
+
+        self._vn_cache[node] = canonical
+        return canonical
+
+    # Exact type → handler(self, obj), checked before falling back to isinstance().
+    # 1 == 1.0 == True, but they are not interchangeable as op args (e.g. they
+    # affect type promotion), so floats and bools keep their type in the key.
+    _HASHABLE_DISPATCH = {
+        Node: lambda self, obj: self._vn_cache[obj],
+        int: lambda self, obj: obj,
+        float: lambda self, obj: (float, obj),
+        bool: lambda self, obj: (bool, obj),
+        str: lambda self, obj: obj,
+        type(None): lambda self, obj: obj,
+        torch.dtype: lambda self, obj: obj,
+        tuple: lambda self, obj: self._hashable_seq(obj),
+        list: lambda self, obj: self._hashable_seq(obj),
+        immutable_list: lambda self, obj: self._hashable_seq(obj),
+        dict: lambda self, obj: self._hashable_dict(obj),
+        immutable_dict: lambda self, obj: self._hashable_dict(obj),
+        torch.device: lambda self, obj: str(obj),
+        torch.layout: lambda self, obj: str(obj),
+        torch.memory_format: lambda self, obj: str(obj),
+    }
+
+    def _hashable_seq(self, obj) -> tuple:
+        return tuple(self._make_hashable(x) for x in obj)
+
+    def _hashable_dict(self, obj) -> tuple:
+        return tuple((k, self._make_hashable(v)) for k, v in sorted(obj.items()))
 
     def _make_hashable(self, obj) -> Any:
         """Convert args/kwargs to a hashable form.
 
-        For Node args, returns the integer value number — keeping
-        all signature tuples flat and O(1) to hash.
+        For Node args, returns the (already assigned) canonical node —
+        keeping all signature tuples flat and O(1) to hash.
         """
+        handler = self._HASHABLE_DISPATCH.get(type(obj))
+        if handler is not None:
+            return handler(self, obj)
+
+        # Subclasses of the types above.
         if isinstance(obj, Node):
-            return self._value_number(obj)
-        elif isinstance(obj, (int, float, str, bool, type(None))):
+            return self._vn_cache[obj]
+        elif isinstance(obj, float):
+            return (float, obj)
+        elif isinstance(obj, (int, str)):
             return obj
         elif isinstance(obj, (list, tuple)):
-            return tuple(self._make_hashable(x) for x in obj)
+            return self._hashable_seq(obj)
         elif isinstance(obj, dict):
-            return tuple(sorted((k, self._make_hashable(v)) for k, v in obj.items()))
-        elif isinstance(obj, torch.dtype):
-            return obj
-        elif isinstance(obj, torch.device):
-            return str(obj)
-        elif isinstance(obj, torch.layout):
-            return str(obj)
-        elif isinstance(obj, torch.memory_format):
-            return str(obj)
+            return self._hashable_dict(obj)
         else:
             raise TypeError(f"Cannot make {type(obj)} hashable")
@@ -7,10 +7,13 @@
 # pyre-strict
 import copy
 import itertools
+import operator
 import os
+import sys
 import tempfile
 import unittest
 from typing import Callable, List, Optional, Tuple
+from unittest import mock
 
 import executorch.exir as exir
 
@@ -93,6 +96,7 @@ from torch.export import export
 from torch.export.graph_signature import InputKind, InputSpec, TensorArgument
 from torch.fx import GraphModule, subgraph_rewriter
 from torch.fx.experimental.proxy_tensor import make_fx
+from torch.fx.immutable_collections import immutable_dict, immutable_list
 from torch.library import impl, Library
 from torch.testing import FileCheck
 from torch.utils import _pytree as pytree
@@ -2511,6 +2515,10 @@ class TestCSEPass(unittest.TestCase):
         edge = to_edge(ep)
         return edge.exported_program().graph_module
 
+    @staticmethod
+    def _to_gm(graph):
+        return GraphModule(torch.nn.Module(), graph)
+
     @staticmethod
     def _count_ops(gm, target):
         return sum(
@@ -2590,3 +2598,181 @@ class TestCSEPass(unittest.TestCase):
         self.assertTrue(result.modified)
         self.assertEqual(self._count_ops(result.graph_module, neg_target), 1)
         self.assertEqual(self._count_ops(result.graph_module, abs_target), 1)
+
+    def test_chain_deeper_than_recursion_limit_deduplicated(self):
+        """Duplicate chains deeper than the recursion limit are merged."""
+        neg = torch.ops.aten.neg.default
+        depth = sys.getrecursionlimit() + 100
+
+        graph = torch.fx.Graph()
+        x = graph.placeholder("x")
+        chains = []
+        for _ in range(2):
+            node = x
+            for _ in range(depth):
+                node = graph.call_function(neg, (node,))
+            chains.append(node)
+        out = graph.call_function(torch.ops.aten.add.Tensor, tuple(chains))
+        graph.output((out,))
+
+        result = CSEPass()(self._to_gm(graph))
+
+        self.assertTrue(result.modified)
+        self.assertEqual(self._count_ops(result.graph_module, neg), depth)
+
+    def test_non_topological_graph_keeps_node_unique(self):
+        """A node whose input appears later in the graph is not merged."""
+        neg = torch.ops.aten.neg.default
+        abs_ = torch.ops.aten.abs.default
+        add = torch.ops.aten.add.Tensor
+
+        graph = torch.fx.Graph()
+        x = graph.placeholder("x")
+        a = graph.call_function(neg, (x,))
+        b = graph.call_function(neg, (x,))
+        c = graph.call_function(abs_, (a,))
+        d = graph.call_function(abs_, (a,))
+        out = graph.call_function(add, (graph.call_function(add, (b, c)), d))
+        graph.output((out,))
+        # Move c in front of its input a.
+        a.prepend(c)
+
+        result = CSEPass()(self._to_gm(graph))
+
+        self.assertTrue(result.modified)
+        self.assertEqual(self._count_ops(result.graph_module, neg), 1)
+        self.assertEqual(self._count_ops(result.graph_module, abs_), 2)
+
+    def test_int_float_bool_scalars_not_merged(self):
+        """mul(x, 1), mul(x, 1.0) and mul(x, True) differ in type promotion."""
+        mul = torch.ops.aten.mul.Scalar
+        add = torch.ops.aten.add.Tensor
+
+        graph = torch.fx.Graph()
+        x = graph.placeholder("x")
+        a = graph.call_function(mul, (x, 1))
+        b = graph.call_function(mul, (x, 1.0))
+        c = graph.call_function(mul, (x, True))
+        out = graph.call_function(add, (graph.call_function(add, (a, b)), c))
+        graph.output((out,))
+
+        result = CSEPass()(self._to_gm(graph))
+
+        self.assertFalse(result.modified)
+        self.assertEqual(self._count_ops(result.graph_module, mul), 3)
+
+    def test_duplicate_container_args_deduplicated(self):
+        """Ops with list (immutable_list) and dict (immutable_dict) args are merged."""
+        cat = torch.ops.aten.cat.default
+        add = torch.ops.aten.add.Tensor
+
+        graph = torch.fx.Graph()
+        x = graph.placeholder("x")
+        y = graph.placeholder("y")
+        a = graph.call_function(cat, ([x, y], 0))
+        b = graph.call_function(cat, ([x, y], 0))
+        c = graph.call_function(operator.getitem, ({"k": x}, "k"))
+        d = graph.call_function(operator.getitem, ({"k": x}, "k"))
+        out = graph.call_function(add, (graph.call_function(add, (a, b)), c))
+        out = graph.call_function(add, (out, d))
+        graph.output((out,))
+        self.assertIsInstance(a.args[0], immutable_list)
+        self.assertIsInstance(c.args[0], immutable_dict)
+
+        result = CSEPass()(self._to_gm(graph))
+
+        self.assertTrue(result.modified)
+        self.assertEqual(self._count_ops(result.graph_module, cat), 1)
+        self.assertEqual(self._count_ops(result.graph_module, operator.getitem), 1)
+
+    def _duplicate_neg_graph(self):
+        neg = torch.ops.aten.neg.default
+        graph = torch.fx.Graph()
+        x = graph.placeholder("x")
+        a = graph.call_function(neg, (x,))
+        b = graph.call_function(neg, (x,))
+        out = graph.call_function(torch.ops.aten.add.Tensor, (a, b))
+        graph.output((out,))
+        return self._to_gm(graph)
+
+    def test_lint_only_with_env_flag(self):
+        """graph.lint() runs after CSE only when EXECUTORCH_CSE_LINT=1."""
+        for flag, expect_lint in ((None, False), ("0", False), ("1", True)):
+            gm = self._duplicate_neg_graph()
+            with self.subTest(flag=flag), mock.patch.dict(os.environ):
+                os.environ.pop("EXECUTORCH_CSE_LINT", None)
+                if flag is not None:
+                    os.environ["EXECUTORCH_CSE_LINT"] = flag
+
+                with mock.patch.object(
+                    torch.fx.Graph,
+                    "lint",
+                    autospec=True,
+                    side_effect=torch.fx.Graph.lint,
+                ) as lint_spy:
+                    result = CSEPass()(gm)
+
+                self.assertTrue(result.modified)
+                self.assertEqual(lint_spy.called, expect_lint)
+
+    def test_unique_targets_skip_setup(self):
+        """Graphs without a repeated target return before numbering any node."""
+        graph = torch.fx.Graph()
+        x = graph.placeholder("x")
+        a = graph.call_function(torch.ops.aten.neg.default, (x,))
+        out = graph.call_function(torch.ops.aten.abs.default, (a,))
+        graph.output((out,))
+
+        with mock.patch.object(CSEPass, "_canonical_node") as canonical_node:
+            result = CSEPass()(self._to_gm(graph))
+
+        self.assertFalse(result.modified)
+        canonical_node.assert_not_called()
+
+    def test_unhashable_target_not_merged(self):
+        """call_function targets without __hash__ are treated as unsafe."""
+
+        class UnhashableIdentity:
+            __name__ = "unhashable_identity"
+
+            def __eq__(self, other):
+                return self is other
+
+            def __call__(self, x):
+                return x
+
+        identity = UnhashableIdentity()
+        neg = torch.ops.aten.neg.default
+
+        graph = torch.fx.Graph()
+        x = graph.placeholder("x")
+        a = graph.call_function(identity, (x,))
+        b = graph.call_function(identity, (x,))
+        c = graph.call_function(neg, (a,))
+        d = graph.call_function(neg, (b,))
+        out = graph.call_function(torch.ops.aten.add.Tensor, (c, d))
+        graph.output((out,))
+
+        result = CSEPass()(self._to_gm(graph))
+
+        self.assertFalse(result.modified)
+        self.assertEqual(self._count_ops(result.graph_module, identity), 2)
+
+    def test_node_arg_not_merged_with_int_arg(self):
+        """add(x, y) and add(x, 1) must not be merged, whatever value number y has.
+
+        With integer value numbers, y (the second node) used to be numbered 1
+        and both signatures became (add, 0, 1).
+        """
+        graph = torch.fx.Graph()
+        x = graph.placeholder("x")
+        y = graph.placeholder("y")
+        a = graph.call_function(operator.add, (x, y))
+        b = graph.call_function(operator.add, (x, 1))
+        out = graph.call_function(operator.mul, (a, b))
+        graph.output((out,))
+
+        result = CSEPass()(self._to_gm(graph))
+
+        self.assertFalse(result.modified)
+        self.assertEqual(self._count_ops(result.graph_module, operator.add), 2)
@@ -5,10 +5,14 @@
 # LICENSE file in the root directory of this source tree.
 
 try:
-    from pathlib import Path
+    import os
 
-    libs = list(Path(__file__).parent.resolve().glob("*portable_custom_ops_aot_lib.*"))
-    del Path
+    libs = [
+        entry.path
+        for entry in os.scandir(os.path.dirname(os.path.abspath(__file__)))
+        if "portable_custom_ops_aot_lib." in entry.name
+    ]
+    del os
     if not libs:
         raise RuntimeError("No portable_custom_ops_aot_lib library found.")
     if len(libs) > 1:
@@ -17,7 +21,7 @@ try:
         )
     import torch as _torch
 
-    _torch.ops.load_library(str(libs[0]))
+    _torch.ops.load_library(libs[0])
     del _torch
 except Exception:  # noqa: E722
     import logging